@@ -1,5 +1,18 @@
 """n1-brightdata package."""
 
-from .agent import AgentConfig, build_agent_config, run_agent
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .agent import AgentConfig, build_agent_config, run_agent
 
 __all__ = ["AgentConfig", "build_agent_config", "run_agent"]
+
+
+def __getattr__(name: str) -> Any:
+    # PEP 562 lazy re-export: keeps `import n1_brightdata` (and the CLI entry
+    # point, which imports the package first) from loading the agent stack.
+    if name in __all__:
+        from . import agent
+
+        return getattr(agent, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,106 @@
+"""The `run` command, loaded on demand by the CLI group."""
+
+from pathlib import Path
+
+import click
+
+from .console import print_error
+
+
+@click.command("run")
+@click.argument("task", required=True)
+@click.option(
+    "--url",
+    default="https://www.google.com",
+    show_default=True,
+    help="Initial URL to open before the agent loop starts.",
+)
+@click.option(
+    "--max-steps",
+    type=click.IntRange(min=1),
+    default=30,
+    show_default=True,
+    help="Maximum number of tool-using iterations.",
+)
+@click.option(
+    "--screenshot-format",
+    type=click.Choice(["jpeg", "png"], case_sensitive=False),
+    default="jpeg",
+    show_default=True,
+    help="Screenshot format sent to the model.",
+)
+@click.option(
+    "--jpeg-quality",
+    type=click.IntRange(1, 100),
+    default=60,
+    show_default=True,
+    help="JPEG quality used when --screenshot-format=jpeg.",
+)
+@click.option(
+    "--screenshot-timeout-ms",
+    type=click.IntRange(min=1),
+    default=90_000,
+    show_default=True,
+    help="Timeout for Playwright page screenshots in milliseconds.",
+)
+@click.option(
+    "--show-inspect-url",
+    is_flag=True,
+    default=False,
+    help="Print a DevTools inspect URL for the live browser session.",
+)
+@click.option(
+    "--yutori-api-key",
+    envvar="YUTORI_API_KEY",
+    show_envvar=True,
+    default=None,
+    help="Yutori API key.",
+)
+@click.option(
+    "--brd-cdp-url",
+    envvar="BRD_CDP_URL",
+    show_envvar=True,
+    default=None,
+    help="Bright Data Scraping Browser CDP WebSocket URL.",
+)
+@click.option(
+    "--env-file",
+    type=click.Path(path_type=Path, dir_okay=False, resolve_path=True),
+    default=None,
+    help="Path to a .env file. Defaults to ./.env when omitted.",
+)
+def cmd(
+    task: str,
+    url: str,
+    max_steps: int,
+    screenshot_format: str,
+    jpeg_quality: int,
+    screenshot_timeout_ms: int,
+    show_inspect_url: bool,
+    yutori_api_key: str | None,
+    brd_cdp_url: str | None,
+    env_file: Path | None,
+) -> None:
+    """Run the n1 Bright Data browser agent."""
+    # Deferred so `--help` skips the agent stack import cost.
+    from .agent import build_agent_config, run_agent
+
+    try:
+        config = build_agent_config(
+            env_file=env_file,
+            yutori_api_key=yutori_api_key,
+            brd_cdp_url=brd_cdp_url,
+            screenshot_format=screenshot_format,
+            jpeg_quality=jpeg_quality,
+            screenshot_timeout_ms=screenshot_timeout_ms,
+        )
+        run_agent(
+            task=task,
+            start_url=url,
+            max_steps=max_steps,
+            config=config,
+            show_inspect_url=show_inspect_url,
+        )
+    except RuntimeError as exc:
+        print_error(str(exc))
+        raise SystemExit(1) from exc
@@ -0,0 +1,300 @@
+"""The `setup` wizard command, loaded on demand by the CLI group."""
+
+from contextlib import contextmanager
+from functools import lru_cache
+from pathlib import Path
+from types import MappingProxyType
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+import click
+
+from .console import _get_console, print_error, status_spinner
+
+CREDENTIALS_PATH = Path.home() / ".n1-brightdata" / "credentials.json"
+
+
+def _ask(label: str) -> str:
+    # rich.prompt.Prompt spins up a full prompt object per question; the
+    # wizard only needs a styled label in front of a plain input().
+    _get_console().print(f"{label}: ", end="")
+    return input()
+
+
+def _confirm(label: str, *, default: bool = True) -> bool:
+    # Backslash keeps the bracketed hint literal under rich markup.
+    _get_console().print(f"{label} \\[{'Y/n' if default else 'y/N'}] ", end="")
+    answer = input().strip().lower()
+    if not answer:
+        return default
+    return answer in ("y", "yes")
+
+
+def _wizard_step_header(step: int, total: int, title: str) -> None:
+    from rich.rule import Rule
+
+    _get_console().print(
+        Rule(f"[step]Step {step} of {total}[/step]  {title}", style="dim"),
+        new_line_start=True,
+    )
+
+
+@lru_cache(maxsize=1)
+def _read_credentials() -> MappingProxyType[str, str]:
+    # Cached for the lifetime of the wizard run; read-only so a stale copy
+    # cannot be mutated by accident -- callers take dict() when they edit.
+    if not CREDENTIALS_PATH.exists():
+        return MappingProxyType({})
+    try:
+        from orjson import loads
+    except ImportError:
+        loads = json.loads
+    try:
+        data = loads(CREDENTIALS_PATH.read_bytes())
+        return MappingProxyType({k: v for k, v in data.items() if isinstance(v, str)})
+    except Exception:
+        return MappingProxyType({})
+
+
+def _write_credentials(values: dict[str, str]) -> None:
+    CREDENTIALS_PATH.parent.mkdir(parents=True, exist_ok=True)
+    payload = {
+        "YUTORI_API_KEY": values.get("YUTORI_API_KEY", ""),
+        "BRD_CDP_URL": values.get("BRD_CDP_URL", ""),
+    }
+    try:
+        import orjson
+
+        body = orjson.dumps(payload, option=orjson.OPT_INDENT_2) + b"\n"
+    except ImportError:
+        body = (json.dumps(payload, indent=2) + "\n").encode("utf-8")
+    # Write to a sibling temp file and rename into place so a crash
+    # mid-write can never leave a truncated or world-readable file behind.
+    tmp = tempfile.NamedTemporaryFile(
+        mode="wb", dir=CREDENTIALS_PATH.parent, delete=False
+    )
+    try:
+        if hasattr(os, "fchmod"):
+            os.fchmod(tmp.fileno(), 0o600)
+        else:  # Windows has no fchmod; chmod the temp file by name.
+            os.chmod(tmp.name, 0o600)
+        tmp.write(body)
+        tmp.close()
+        os.replace(tmp.name, CREDENTIALS_PATH)
+    except BaseException:
+        tmp.close()
+        os.unlink(tmp.name)
+        raise
+
+
+@lru_cache(maxsize=8)
+def _mask(value: str) -> str:
+    return value[:4] + "****" + value[-4:] if len(value) > 8 else "****"
+
+
+@lru_cache(maxsize=4)
+def _yutori_client(api_key: str):
+    # One client per key, so a re-test after a typo fix reuses neither the
+    # bad client nor its connection pool.
+    from openai import OpenAI
+
+    return OpenAI(base_url="https://api.yutori.com/v1", api_key=api_key)
+
+
+@contextmanager
+def _playwright_session():
+    from playwright.sync_api import sync_playwright
+
+    with sync_playwright() as p:
+        yield p
+
+
+def _test_yutori(api_key: str) -> bool:
+    try:
+        _yutori_client(api_key).models.list()
+        return True
+    except Exception:
+        return False
+
+
+def _chromium_installed() -> bool:
+    # Mirrors Playwright's registry layout: browser builds live in
+    # chromium-<revision> directories under the browsers path.
+    browsers_root = Path(
+        os.environ.get(
+            "PLAYWRIGHT_BROWSERS_PATH",
+            Path.home() / ".cache" / "ms-playwright",
+        )
+    )
+    return any(browsers_root.glob("chromium-*"))
+
+
+def _probe_cdp_websocket(cdp_url: str) -> bool:
+    """Cheap CDP reachability check over a raw WebSocket.
+
+    Only a successful probe is conclusive: websocket-client is optional,
+    and it does not send the basic-auth userinfo that Bright Data URLs
+    carry, so any failure here just means the caller must try a full
+    Playwright connection.
+    """
+    try:
+        import websocket
+    except ImportError:
+        return False
+    try:
+        ws = websocket.create_connection(cdp_url, timeout=15)
+        try:
+            ws.send(json.dumps({"id": 1, "method": "Browser.getVersion"}))
+            reply = json.loads(ws.recv())
+        finally:
+            ws.close()
+        return "result" in reply
+    except Exception:
+        return False
+
+
+def _test_brightdata(cdp_url: str) -> bool:
+    if _probe_cdp_websocket(cdp_url):
+        return True
+    try:
+        with _playwright_session() as p:
+            browser = p.chromium.connect_over_cdp(cdp_url)
+            browser.close()
+        return True
+    except Exception:
+        return False
+
+
+@click.command("setup")
+@click.option(
+    "--force",
+    is_flag=True,
+    default=False,
+    help="Reinstall Playwright Chromium even if a build is already present.",
+)
+def cmd(force: bool) -> None:
+    """Interactive setup wizard -- credentials, Playwright, and connectivity."""
+    from rich.panel import Panel
+
+    total = 5
+    console = _get_console()
+
+    # Banner
+    console.print()
+    console.print(
+        Panel(
+            "[brand]n1-brightdata[/brand]  [muted]Setup Wizard[/muted]",
+            border_style="bright_cyan",
+            padding=(0, 2),
+        )
+    )
+
+    env_values = dict(_read_credentials())
+
+    # -- Step 1: Bright Data ------------------------------------------------
+    _wizard_step_header(1, total, "Bright Data Scraping Browser")
+
+    existing_brd = env_values.get("BRD_CDP_URL", "").strip()
+    use_existing_brd = False
+    if existing_brd and existing_brd != "YOUR_CDP_URL":
+        console.print(f"  [success]Found existing Bright Data CDP URL[/success]  [muted]{_mask(existing_brd)}[/muted]")
+        use_existing_brd = _confirm("  Use existing URL?", default=True)
+
+    if not use_existing_brd:
+        console.print(
+            "  You need a Bright Data [bold]Scraping Browser[/bold] zone.\n\n"
+            "  1. Sign up or log in at:\n"
+            "     [url]https://brightdata.com[/url]\n\n"
+            "  2. Go to the dashboard and create a new\n"
+            "     [bold]Scraping Browser[/bold] zone.\n\n"
+            "  3. Copy the CDP WebSocket URL (starts with wss://).\n"
+        )
+        brd_cdp_url = _ask("  Paste your Bright Data CDP URL")
+        env_values["BRD_CDP_URL"] = brd_cdp_url.strip()
+        console.print("  [success]Bright Data CDP URL saved.[/success]")
+
+    _wizard_step_header(2, total, "Yutori API Key")
+
+    existing_yt = env_values.get("YUTORI_API_KEY", "").strip()
+    use_existing_yt = False
+    if existing_yt and existing_yt != "YOUR_API_KEY":
+        console.print(f"  [success]Found existing Yutori API key[/success]  [muted]{_mask(existing_yt)}[/muted]")
+        use_existing_yt = _confirm("  Use existing key?", default=True)
+
+    if not use_existing_yt:
+        console.print(
+            "  You need a Yutori API key.\n\n"
+            "  1. Sign up or log in at:\n"
+            "     [url]https://yutori.com[/url]\n\n"
+            "  2. Navigate to API keys and create one.\n"
+        )
+        yt_key = _ask("  Paste your Yutori API key")
+        env_values["YUTORI_API_KEY"] = yt_key.strip()
+        console.print("  [success]Yutori API key saved.[/success]")
+
+    _wizard_step_header(3, total, "Save Configuration")
+
+    with status_spinner("Writing credentials..."):
+        _write_credentials(env_values)
+    console.print(f"  [success]Saved credentials[/success] to [muted]{CREDENTIALS_PATH}[/muted]")
+
+    _wizard_step_header(4, total, "Install Playwright")
+
+    if not force and _chromium_installed():
+        console.print(
+            "  [success]Playwright Chromium already installed.[/success]"
+            "  [muted]Use --force to reinstall.[/muted]"
+        )
+    else:
+        try:
+            with status_spinner("Installing Playwright Chromium..."):
+                subprocess.run(
+                    [sys.executable, "-m", "playwright", "install", "chromium"],
+                    check=True,
+                    capture_output=True,
+                )
+            console.print("  [success]Playwright Chromium is ready.[/success]")
+        except subprocess.CalledProcessError as exc:
+            print_error(
+                f"Failed to install Playwright Chromium (exit code {exc.returncode})."
+            )
+            raise SystemExit(1) from exc
+
+    _wizard_step_header(5, total, "Verify Connectivity")
+
+    if _confirm("  Test credentials now?", default=True):
+        from concurrent.futures import ThreadPoolExecutor
+
+        # Both checks are network-bound, so overlap them; results are
+        # rendered in a fixed order once both have finished.
+        with status_spinner("Testing Yutori and Bright Data connections..."):
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                yt_future = executor.submit(_test_yutori, env_values.get("YUTORI_API_KEY", ""))
+                brd_future = executor.submit(_test_brightdata, env_values.get("BRD_CDP_URL", ""))
+                yt_ok = yt_future.result()
+                brd_ok = brd_future.result()
+        if yt_ok:
+            console.print("  [success]Yutori API: connected[/success]")
+        else:
+            console.print("  [error]Yutori API: connection failed. Check your API key.[/error]")
+
+        if brd_ok:
+            console.print("  [success]Bright Data: connected successfully[/success]")
+        else:
+            console.print("  [error]Bright Data: connection failed. Check your password.[/error]")
+    else:
+        console.print("  [muted]Skipped connectivity check.[/muted]")
+
+    console.print()
+    console.print(
+        Panel(
+            "[success]Setup complete![/success]\n\n"
+            "Run your first task:\n"
+            '[bold]n1-brightdata "Search for latest news"[/bold]',
+            border_style="green",
+            padding=(1, 2),
+        )
+    )
@@ -1,23 +1,34 @@
-import base64
+from __future__ import annotations
+
+import binascii
 import json
 import os
+import re
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any, Callable
 from urllib.parse import urlparse, urlunparse
 
-from openai import APIStatusError, OpenAI
-from playwright.sync_api import (
-    Error as PlaywrightError,
-    TimeoutError as PlaywrightTimeoutError,
-    sync_playwright,
-)
 from yutori.n1.payload import (
     DEFAULT_KEEP_RECENT_SCREENSHOTS,
     DEFAULT_MAX_REQUEST_BYTES,
-    trim_images_to_fit,
 )
 
+try:
+    from orjson import dumps as _json_dumps, loads as _json_loads
+except ImportError:
+    _json_loads = json.loads
+
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+if TYPE_CHECKING:
+    from openai import OpenAI
+
 from .console import (
     print_banner,
     print_config_summary,
@@ -53,6 +64,13 @@ BROWSER_AGENT_SYSTEM_PROMPT = (
     "and compile all gathered information into a complete final answer without calling any tools."
 )
 
+# Built once so every run (and every serialized request) reuses the same
+# message object instead of re-allocating the prompt dict per session.
+_SYSTEM_MESSAGE: dict[str, Any] = {
+    "role": "system",
+    "content": BROWSER_AGENT_SYSTEM_PROMPT,
+}
+
 
 @dataclass(frozen=True)
 class AgentConfig:
@@ -90,6 +108,20 @@ class AgentConfig:
         elif threshold > 1.0:
             threshold = 1.0
         object.__setattr__(self, "stop_confidence_threshold", threshold)
+        # Kwargs for page.screenshot, built once; the driver-side timeout
+        # keeps a hung capture from blocking the run.
+        screenshot_kwargs: dict[str, Any] = {
+            "type": self.screenshot_format,
+            "timeout": self.screenshot_timeout_ms,
+            "animations": "disabled",
+            "caret": "hide",
+        }
+        if self.screenshot_format == "jpeg":
+            screenshot_kwargs["quality"] = self.jpeg_quality
+        object.__setattr__(self, "screenshot_kwargs", screenshot_kwargs)
+        # Scale factors from n1's 1000x1000 coordinate space to the viewport.
+        object.__setattr__(self, "_sx", self.viewport_w * 0.001)
+        object.__setattr__(self, "_sy", self.viewport_h * 0.001)
 
     @property
     def image_mime(self) -> str:
@@ -108,41 +140,65 @@ def _load_global_credentials() -> None:
     if not CREDENTIALS_PATH.exists():
         return
     try:
-        data = json.loads(CREDENTIALS_PATH.read_text(encoding="utf-8"))
+        # read_bytes + the orjson-backed loader skip the intermediate str
+        # and its UTF-8 decode.
+        data = _json_loads(CREDENTIALS_PATH.read_bytes())
     except Exception:
         return
+    if not isinstance(data, dict):
+        return
     for key in ("YUTORI_API_KEY", "BRD_CDP_URL"):
         value = data.get(key, "")
         if isinstance(value, str) and value.strip():
             os.environ.setdefault(key, value.strip())
 
 
+# Matches one KEY=value line (optional export prefix, quoted or bare value,
+# whitespace-preceded trailing comment) so the fallback parser makes a single
+# pass in C instead of strip/split/startswith per line in Python. Horizontal
+# whitespace only around the value -- \s would let an empty assignment run
+# into the next line -- and a '#' with no whitespace before it is part of
+# the value, matching python-dotenv.
+_ENV_RE = re.compile(
+    r"^[ \t]*(?:export[ \t]+)?([A-Za-z_][A-Za-z0-9_]*)[ \t]*="
+    r"[ \t]*(?:\"([^\"\n]*)\"|'([^'\n]*)'|([^\n]*?))[ \t]*(?:[ \t]#.*)?$",
+    re.M,
+)
+
+
+@lru_cache(maxsize=8)
+def _parse_env_file(path: str, mtime_ns: int, size: int) -> tuple[tuple[str, str], ...]:
+    """Parse one .env file into key/value pairs.
+
+    Keyed on (path, mtime_ns, size) so repeated loads within a process hit
+    the cache while any edit to the file invalidates it.
+    """
+    try:
+        from dotenv import dotenv_values
+    except Exception:
+        text = Path(path).read_text(encoding="utf-8")
+        return tuple(
+            (m.group(1), (m.group(2) or m.group(3) or m.group(4) or "").rstrip())
+            for m in _ENV_RE.finditer(text)
+        )
+    return tuple(
+        (key, value) for key, value in dotenv_values(path).items() if value is not None
+    )
+
+
 def _load_env_file(env_file: str | Path) -> None:
     """Load a .env file into os.environ (for optional tuning vars)."""
     env_path = Path(env_file).expanduser()
     if not env_path.is_absolute():
         env_path = (Path.cwd() / env_path).resolve()
-    if not env_path.exists():
-        return
     try:
-        from dotenv import load_dotenv
-    except Exception:
-        for raw_line in env_path.read_text(encoding="utf-8").splitlines():
-            line = raw_line.strip()
-            if not line or line.startswith("#"):
-                continue
-            if line.startswith("export "):
-                line = line[len("export "):].strip()
-            if "=" not in line:
-                continue
-            key, value = line.split("=", 1)
-            key = key.strip()
-            value = value.strip()
-            if len(value) >= 2 and value[0] == value[-1] and value[0] in {"'", '"'}:
-                value = value[1:-1]
-            os.environ.setdefault(key, value)
-    else:
-        load_dotenv(dotenv_path=env_path, override=False)
+        stat = env_path.stat()
+    except OSError:
+        return
+    # setdefault stays outside the cache: parsed pairs are reusable, but
+    # which ones apply depends on the current environment.
+    for key, value in _parse_env_file(str(env_path), stat.st_mtime_ns, stat.st_size):
+        os.environ.setdefault(key, value)
 
 
 def load_env(env_file: str | Path | None = None) -> None:
@@ -157,7 +213,7 @@ def load_env(env_file: str | Path | None = None) -> None:
 
 
 def get_required_env(name: str, provided: str | None = None) -> str:
-    value = (provided if provided is not None else os.environ.get(name) or "").strip()
+    value = (provided or os.getenv(name, "")).strip()
     if not value or value == "YOUR_API_KEY":
         # Env var is empty/placeholder – try credentials saved by `yutori auth login`
         if name == "YUTORI_API_KEY":
@@ -170,9 +226,9 @@ def get_required_env(name: str, provided: str | None = None) -> str:
     return value
 
 
-def _get_optional_env_int(name: str, default: int) -> int:
-    raw = os.environ.get(name)
-    if raw is None or not raw.strip():
+def _get_optional_env_int(env: dict[str, str], name: str, default: int) -> int:
+    raw = env.get(name, "").strip()
+    if not raw:
         return default
     try:
         return int(raw)
@@ -180,9 +236,9 @@ def _get_optional_env_int(name: str, default: int) -> int:
         raise RuntimeError(f"{name} must be an integer. Got: {raw!r}") from exc
 
 
-def _get_optional_env_float(name: str, default: float) -> float:
-    raw = os.environ.get(name)
-    if raw is None or not raw.strip():
+def _get_optional_env_float(env: dict[str, str], name: str, default: float) -> float:
+    raw = env.get(name, "").strip()
+    if not raw:
         return default
     try:
         return float(raw)
@@ -190,12 +246,12 @@ def _get_optional_env_float(name: str, default: float) -> float:
         raise RuntimeError(f"{name} must be a float. Got: {raw!r}") from exc
 
 
-def _get_optional_env_bool(name: str, default: bool) -> bool:
-    raw = os.environ.get(name)
-    if raw is None or not raw.strip():
+def _get_optional_env_bool(env: dict[str, str], name: str, default: bool) -> bool:
+    raw = env.get(name, "").strip()
+    if not raw:
         return default
 
-    value = raw.strip().lower()
+    value = raw.lower()
     if value in {"1", "true", "yes", "on"}:
         return True
     if value in {"0", "false", "no", "off"}:
@@ -221,8 +277,12 @@ def build_agent_config(
 ) -> AgentConfig:
     load_env(env_file)
 
+    # One snapshot feeds every optional lookup below; each os.environ access
+    # goes through the _Environ wrapper, and these vars cannot change mid-call.
+    env = dict(os.environ)
+
     if screenshot_format is None:
-        screenshot_format = (os.environ.get("N1_SCREENSHOT_FORMAT") or DEFAULT_SCREENSHOT_FORMAT).strip().lower()
+        screenshot_format = (env.get("N1_SCREENSHOT_FORMAT") or DEFAULT_SCREENSHOT_FORMAT).strip().lower()
 
     return AgentConfig(
         yutori_api_key=get_required_env("YUTORI_API_KEY", yutori_api_key),
@@ -230,63 +290,79 @@ def build_agent_config(
         model=model,
         max_request_bytes=max_request_bytes
         if max_request_bytes is not None
-        else _get_optional_env_int("N1_MAX_REQUEST_BYTES", DEFAULT_MAX_REQUEST_BYTES),
+        else _get_optional_env_int(env, "N1_MAX_REQUEST_BYTES", DEFAULT_MAX_REQUEST_BYTES),
         keep_recent_screenshots=keep_recent_screenshots
         if keep_recent_screenshots is not None
         else _get_optional_env_int(
-            "N1_KEEP_RECENT_SCREENSHOTS", DEFAULT_KEEP_RECENT_SCREENSHOTS
+            env, "N1_KEEP_RECENT_SCREENSHOTS", DEFAULT_KEEP_RECENT_SCREENSHOTS
         ),
         screenshot_format=screenshot_format,
         jpeg_quality=jpeg_quality
         if jpeg_quality is not None
-        else _get_optional_env_int("N1_JPEG_QUALITY", DEFAULT_JPEG_QUALITY),
+        else _get_optional_env_int(env, "N1_JPEG_QUALITY", DEFAULT_JPEG_QUALITY),
         screenshot_timeout_ms=screenshot_timeout_ms
         if screenshot_timeout_ms is not None
         else _get_optional_env_int(
-            "N1_SCREENSHOT_TIMEOUT_MS", DEFAULT_SCREENSHOT_TIMEOUT_MS
+            env, "N1_SCREENSHOT_TIMEOUT_MS", DEFAULT_SCREENSHOT_TIMEOUT_MS
         ),
         enable_sufficiency_check=enable_sufficiency_check
         if enable_sufficiency_check is not None
         else _get_optional_env_bool(
-            "N1_ENABLE_SUFFICIENCY_CHECK", DEFAULT_ENABLE_SUFFICIENCY_CHECK
+            env, "N1_ENABLE_SUFFICIENCY_CHECK", DEFAULT_ENABLE_SUFFICIENCY_CHECK
         ),
         stop_confidence_threshold=stop_confidence_threshold
         if stop_confidence_threshold is not None
         else _get_optional_env_float(
-            "N1_STOP_CONFIDENCE_THRESHOLD", DEFAULT_STOP_CONFIDENCE_THRESHOLD
+            env, "N1_STOP_CONFIDENCE_THRESHOLD", DEFAULT_STOP_CONFIDENCE_THRESHOLD
         ),
     )
 
 
+_API_BASE_URL = "https://api.yutori.com/v1"
+
+
 def create_client(config: AgentConfig) -> OpenAI:
+    # Imported here so config/env-only callers skip openai's Pydantic
+    # model-registry init (~200ms) at module import.
+    from openai import OpenAI
+
+    # Newer openai releases bundle the httpx2 fork and type http_client
+    # against it; fall back to plain httpx for older SDKs.
+    try:
+        import httpx2 as httpx
+    except ImportError:
+        import httpx
+
+    # HTTP/2 multiplexing plus a long keep-alive means the ~30 sequential
+    # requests of a run share one TLS connection instead of re-handshaking.
+    http_client = httpx.Client(
+        base_url=_API_BASE_URL,
+        http2=True,
+        limits=httpx.Limits(max_keepalive_connections=5, keepalive_expiry=60.0),
+        timeout=httpx.Timeout(120.0, connect=10.0),
+    )
     return OpenAI(
-        base_url="https://api.yutori.com/v1",
+        base_url=_API_BASE_URL,
         api_key=config.yutori_api_key,
+        http_client=http_client,
     )
 
 
-def screenshot_b64(page: Any, config: AgentConfig, *, timeout_ms: int | None = None) -> str:
-    page.set_viewport_size({"width": config.viewport_w, "height": config.viewport_h})
-    screenshot_kwargs = {"type": config.screenshot_format}
-    if config.screenshot_format == "jpeg":
-        screenshot_kwargs["quality"] = config.jpeg_quality
-    screenshot_kwargs["timeout"] = (
-        max(1, int(timeout_ms))
-        if timeout_ms is not None
-        else config.screenshot_timeout_ms
-    )
-    screenshot_kwargs["animations"] = "disabled"
-    screenshot_kwargs["caret"] = "hide"
-    img_bytes = page.screenshot(**screenshot_kwargs)
-    return base64.b64encode(img_bytes).decode("utf-8")
+def screenshot_b64(page: Any, config: AgentConfig) -> str:
+    """Capture a screenshot bounded by ``screenshot_timeout_ms``; return base64.
+
+    ``page.screenshot`` enforces the timeout driver-side, so a capture that
+    hangs on a heavy page fails fast enough for the caller's retry ladder
+    instead of blocking the run. Callers prepend the ``data:`` URL prefix,
+    which is fixed per run.
+    """
+    img_bytes = page.screenshot(**config.screenshot_kwargs)
+    return binascii.b2a_base64(img_bytes, newline=False).decode("ascii")
 
 
-def to_abs(coords_1000: tuple[int, int], config: AgentConfig) -> tuple[int, int]:
-    """n1 outputs coords in a 1000x1000 space."""
-    x1000, y1000 = coords_1000
-    x = round((x1000 / 1000) * config.viewport_w)
-    y = round((y1000 / 1000) * config.viewport_h)
-    return x, y
+def to_abs(coords_1000: Any, config: AgentConfig) -> tuple[int, int]:
+    """n1 outputs coords in a 1000x1000 space; accepts any two-item sequence."""
+    return round(coords_1000[0] * config._sx), round(coords_1000[1] * config._sy)
 
 
 def _alternate_www_url(url: str) -> str | None:
@@ -308,77 +384,294 @@ def _is_navigation_cooldown_error(exc: Exception) -> bool:
     return "cannot navigate to this domain again due to cooldown" in text or "no_peers" in text
 
 
+def _tool_left_click(page: Any, args: dict[str, Any], config: AgentConfig) -> None:
+    x, y = to_abs(args["coordinates"], config)
+    page.mouse.click(x, y)
+
+
+def _tool_double_click(page: Any, args: dict[str, Any], config: AgentConfig) -> None:
+    x, y = to_abs(args["coordinates"], config)
+    page.mouse.dblclick(x, y)
+
+
+def _tool_triple_click(page: Any, args: dict[str, Any], config: AgentConfig) -> None:
+    x, y = to_abs(args["coordinates"], config)
+    page.mouse.click(x, y, click_count=3)
+
+
+def _tool_right_click(page: Any, args: dict[str, Any], config: AgentConfig) -> None:
+    x, y = to_abs(args["coordinates"], config)
+    page.mouse.click(x, y, button="right")
+
+
+def _tool_hover(page: Any, args: dict[str, Any], config: AgentConfig) -> None:
+    x, y = to_abs(args["coordinates"], config)
+    page.mouse.move(x, y)
+
+
+def _tool_drag(page: Any, args: dict[str, Any], config: AgentConfig) -> None:
+    sx, sy = to_abs(args["start_coordinates"], config)
+    tx, ty = to_abs(args["coordinates"], config)
+    page.mouse.move(sx, sy)
+    page.mouse.down()
+    page.mouse.move(tx, ty)
+    page.mouse.up()
+
+
+def _tool_scroll(page: Any, args: dict[str, Any], config: AgentConfig) -> None:
+    direction = args["direction"]
+    amount = int(args["amount"])
+    dx = dy = 0
+    if direction == "down":
+        dy = int(0.10 * config.viewport_h * amount)
+    elif direction == "up":
+        dy = -int(0.10 * config.viewport_h * amount)
+    elif direction == "right":
+        dx = int(0.10 * config.viewport_w * amount)
+    elif direction == "left":
+        dx = -int(0.10 * config.viewport_w * amount)
+    page.mouse.wheel(dx, dy)
+
+
+def _tool_type(page: Any, args: dict[str, Any], config: AgentConfig) -> None:
+    text = args["text"]
+    if args.get("clear_before_typing"):
+        page.keyboard.press("Control+A")
+        page.keyboard.press("Backspace")
+    page.keyboard.type(text)
+    if args.get("press_enter_after"):
+        page.keyboard.press("Enter")
+
+
+def _tool_key_press(page: Any, args: dict[str, Any], config: AgentConfig) -> None:
+    page.keyboard.press(args["key_comb"])
+
+
+def _tool_goto_url(page: Any, args: dict[str, Any], config: AgentConfig) -> None:
+    from playwright.sync_api import Error as PlaywrightError
+
+    target_url = args["url"]
+    try:
+        page.goto(target_url, wait_until="domcontentloaded")
+    except PlaywrightError as exc:
+        if not _is_navigation_cooldown_error(exc):
+            raise
+        alt_url = _alternate_www_url(target_url)
+        if not alt_url or alt_url == target_url:
+            raise
+        page.wait_for_timeout(1200)
+        page.goto(alt_url, wait_until="domcontentloaded")
+
+
+def _tool_go_back(page: Any, args: dict[str, Any], config: AgentConfig) -> None:
+    page.go_back(wait_until="domcontentloaded")
+
+
+def _tool_refresh(page: Any, args: dict[str, Any], config: AgentConfig) -> None:
+    page.reload(wait_until="domcontentloaded")
+
+
+def _tool_wait(page: Any, args: dict[str, Any], config: AgentConfig) -> None:
+    # The tool's semantics are "sleep 800ms"; page.wait_for_timeout schedules
+    # the same pause as a browser-side timer, costing a WSS round-trip.
+    time.sleep(0.8)
+
+
+_TOOL_HANDLERS: dict[str, Callable[[Any, dict[str, Any], AgentConfig], None]] = {
+    "left_click": _tool_left_click,
+    "double_click": _tool_double_click,
+    "triple_click": _tool_triple_click,
+    "right_click": _tool_right_click,
+    "hover": _tool_hover,
+    "drag": _tool_drag,
+    "scroll": _tool_scroll,
+    "type": _tool_type,
+    "key_press": _tool_key_press,
+    "goto_url": _tool_goto_url,
+    "go_back": _tool_go_back,
+    "refresh": _tool_refresh,
+    "wait": _tool_wait,
+}
+
+
 def run_tool(page: Any, tool_name: str, args: dict[str, Any], config: AgentConfig) -> None:
-    if tool_name == "left_click":
-        x, y = to_abs(tuple(args["coordinates"]), config)
-        page.mouse.click(x, y)
-    elif tool_name == "double_click":
-        x, y = to_abs(tuple(args["coordinates"]), config)
-        page.mouse.dblclick(x, y)
-    elif tool_name == "triple_click":
-        x, y = to_abs(tuple(args["coordinates"]), config)
-        page.mouse.click(x, y, click_count=3)
-    elif tool_name == "right_click":
-        x, y = to_abs(tuple(args["coordinates"]), config)
-        page.mouse.click(x, y, button="right")
-    elif tool_name == "hover":
-        x, y = to_abs(tuple(args["coordinates"]), config)
-        page.mouse.move(x, y)
-    elif tool_name == "drag":
-        sx, sy = to_abs(tuple(args["start_coordinates"]), config)
-        tx, ty = to_abs(tuple(args["coordinates"]), config)
-        page.mouse.move(sx, sy)
-        page.mouse.down()
-        page.mouse.move(tx, ty)
-        page.mouse.up()
-    elif tool_name == "scroll":
-        direction = args["direction"]
-        amount = int(args["amount"])
-        dx = dy = 0
-        if direction == "down":
-            dy = int(0.10 * config.viewport_h * amount)
-        elif direction == "up":
-            dy = -int(0.10 * config.viewport_h * amount)
-        elif direction == "right":
-            dx = int(0.10 * config.viewport_w * amount)
-        elif direction == "left":
-            dx = -int(0.10 * config.viewport_w * amount)
-        page.mouse.wheel(dx, dy)
-    elif tool_name == "type":
-        text = args["text"]
-        if args.get("clear_before_typing"):
-            page.keyboard.press("Control+A")
-            page.keyboard.press("Backspace")
-        page.keyboard.type(text)
-        if args.get("press_enter_after"):
-            page.keyboard.press("Enter")
-    elif tool_name == "key_press":
-        page.keyboard.press(args["key_comb"])
-    elif tool_name == "goto_url":
-        target_url = args["url"]
-        try:
-            page.goto(target_url, wait_until="domcontentloaded")
-        except PlaywrightError as exc:
-            if not _is_navigation_cooldown_error(exc):
-                raise
-            alt_url = _alternate_www_url(target_url)
-            if not alt_url or alt_url == target_url:
-                raise
-            page.wait_for_timeout(1200)
-            page.goto(alt_url, wait_until="domcontentloaded")
-    elif tool_name == "go_back":
-        page.go_back(wait_until="domcontentloaded")
-    elif tool_name == "refresh":
-        page.reload(wait_until="domcontentloaded")
-    elif tool_name == "wait":
-        page.wait_for_timeout(800)
-    else:
+    handler = _TOOL_HANDLERS.get(tool_name)
+    if handler is None:
         raise ValueError(f"Unsupported tool: {tool_name}")
+    handler(page, args, config)
+
+
+class MessageLog:
+    """Message history with an incremental size index for screenshot trimming.
+
+    Appending a message measures only that message (string content, text
+    parts, and ``image_url`` payload lengths plus a small per-object JSON
+    allowance), keeping a running byte estimate and a deque of image-bearing
+    message indices. ``trim`` then pops oldest screenshots until the estimate
+    fits, so each step pays O(screenshots removed) instead of re-measuring
+    the entire history the way a full-list trimmer does.
+    """
+
+    _PART_OVERHEAD = 64
+    _PLACEHOLDER_TEXT = "Screenshot omitted to stay under request size limit."
+
+    def __init__(self, messages: list[dict[str, Any]] | None = None) -> None:
+        self.msgs: list[dict[str, Any]] = []
+        self.total_bytes = 2  # the enclosing "[]"
+        self.image_entries: deque[tuple[int, int]] = deque()
+        self._sizes: list[int] = []
+        for message in messages or ():
+            self.append(message)
+
+    def append(self, message: dict[str, Any]) -> None:
+        idx = len(self.msgs)
+        self.msgs.append(message)
+        size = self._PART_OVERHEAD
+        content = message.get("content")
+        if isinstance(content, str):
+            size += len(content)
+        elif isinstance(content, list):
+            for part in content:
+                size += self._PART_OVERHEAD
+                if not isinstance(part, dict):
+                    continue
+                if part.get("type") == "image_url":
+                    url = (part.get("image_url") or {}).get("url") or ""
+                    self.image_entries.append((idx, len(url)))
+                    size += len(url)
+                elif part.get("type") == "text":
+                    text = part.get("text")
+                    if isinstance(text, str):
+                        size += len(text)
+        for tool_call in message.get("tool_calls") or ():
+            size += self._PART_OVERHEAD + len(str(tool_call))
+        self._sizes.append(size)
+        self.total_bytes += size
+
+    def pop(self) -> dict[str, Any]:
+        """Remove and return the newest message, unwinding its size entries."""
+        idx = len(self.msgs) - 1
+        while self.image_entries and self.image_entries[-1][0] == idx:
+            self.image_entries.pop()
+        self.total_bytes -= self._sizes.pop()
+        return self.msgs.pop()
+
+    def trim(self, *, max_bytes: int, keep_recent: int) -> tuple[int, int]:
+        """Strip oldest screenshots until the payload estimate fits *max_bytes*.
+
+        The most recent *keep_recent* screenshots are protected while removing
+        older ones suffices; if still over budget, protected screenshots are
+        removed too, oldest first — only the very last one is always kept.
+        Returns ``(current_size_bytes, images_removed)``.
+        """
+        removed = 0
+        for floor in (max(1, keep_recent), 1):
+            while self.total_bytes > max_bytes and len(self.image_entries) > floor:
+                idx, size = self.image_entries.popleft()
+                self._strip_image(idx)
+                self._sizes[idx] -= size
+                self.total_bytes -= size
+                removed += 1
+        return self.total_bytes, removed
+
+    def _strip_image(self, idx: int) -> None:
+        message = self.msgs[idx]
+        content = message.get("content")
+        if not isinstance(content, list):
+            return
+        stripped = False
+        new_content: list[dict[str, Any]] = []
+        for part in content:
+            if not stripped and isinstance(part, dict) and part.get("type") == "image_url":
+                stripped = True
+                continue
+            new_content.append(part)
+        has_text = any(isinstance(p, dict) and p.get("type") == "text" for p in new_content)
+        if not has_text:
+            new_content.append({"type": "text", "text": self._PLACEHOLDER_TEXT})
+        message["content"] = new_content
+
+
+@dataclass
+class _ChatMessage:
+    """Duck-typed stand-in for the SDK's ChatCompletionMessage.
+
+    ``tool_calls`` holds the plain dicts parsed off the wire, ready to be
+    appended to the message history without another serialization pass.
+    """
+
+    content: Any = None
+    tool_calls: list[dict[str, Any]] | None = None
+
+
+@dataclass
+class _ChatChoice:
+    message: _ChatMessage | None = None
+
+
+@dataclass
+class _ChatCompletion:
+    choices: list[_ChatChoice]
+
+
+def _wrap_completion(data: dict[str, Any]) -> Any:
+    choices = data.get("choices")
+    if not isinstance(choices, list) or not choices:
+        # Error-shaped payload: return the dict itself so the caller's
+        # detail extraction (which understands plain dicts) can report it.
+        return data
+    wrapped: list[_ChatChoice] = []
+    for choice in choices:
+        message = choice.get("message") if isinstance(choice, dict) else None
+        if isinstance(message, dict):
+            wrapped.append(
+                _ChatChoice(_ChatMessage(message.get("content"), message.get("tool_calls")))
+            )
+        else:
+            wrapped.append(_ChatChoice())
+    return _ChatCompletion(wrapped)
+
+
+def _post_chat(client: OpenAI, config: AgentConfig, messages: list[dict[str, Any]]) -> Any:
+    """POST /chat/completions straight through the SDK's httpx client.
+
+    The SDK's ``create`` path validates the whole messages list through
+    Pydantic on every call, which walks each base64 screenshot string.
+    Serializing with ``_json_dumps`` and parsing the response ourselves skips
+    that on both sides. Non-2xx responses raise ``APIStatusError`` so callers
+    keep their existing handling.
+    """
+    from openai import APIStatusError
+
+    body = _json_dumps({"model": config.model, "messages": messages})
+    resp = client._client.post(
+        "/chat/completions",
+        content=body,
+        headers={
+            "content-type": "application/json",
+            "authorization": f"Bearer {config.yutori_api_key}",
+        },
+    )
+    try:
+        data = _json_loads(resp.content)
+    except Exception:
+        data = None
+    if resp.status_code >= 400:
+        detail = _extract_response_error_detail(data) if isinstance(data, dict) else None
+        raise APIStatusError(
+            detail or f"HTTP {resp.status_code} from chat completions.",
+            response=resp,
+            body=data,
+        )
+    if not isinstance(data, dict):
+        raise RuntimeError("Chat completions returned a non-JSON response body.")
+    return _wrap_completion(data)
+
 
+def n1_step(log: MessageLog, *, client: OpenAI, config: AgentConfig) -> Any:
+    from openai import APIStatusError
 
-def n1_step(messages: list[dict[str, Any]], *, client: OpenAI, config: AgentConfig) -> Any:
-    size_bytes, removed = trim_images_to_fit(
-        messages,
+    size_bytes, removed = log.trim(
         max_bytes=config.max_request_bytes,
         keep_recent=config.keep_recent_screenshots,
     )
@@ -386,24 +679,17 @@ def n1_step(messages: list[dict[str, Any]], *, client: OpenAI, config: AgentConf
         print_trim_notice(removed, size_bytes / (1024 * 1024))
 
     try:
-        return client.chat.completions.create(
-            model=config.model,
-            messages=messages,
-        )
+        return _post_chat(client, config, log.msgs)
     except APIStatusError as exc:
         if "content length exceeded" in str(exc).lower():
             retry_budget = max(config.max_request_bytes - 250_000, 1_000_000)
-            size_bytes, removed = trim_images_to_fit(
-                messages,
+            size_bytes, removed = log.trim(
                 max_bytes=retry_budget,
                 keep_recent=config.keep_recent_screenshots,
             )
             if removed:
                 print_trim_notice(removed, size_bytes / (1024 * 1024), retry=True)
-                return client.chat.completions.create(
-                    model=config.model,
-                    messages=messages,
-                )
+                return _post_chat(client, config, log.msgs)
         raise
 
 
@@ -463,16 +749,24 @@ def _content_to_text(content: Any) -> str:
     if isinstance(content, str):
         return content.strip()
     if isinstance(content, list):
-        chunks: list[str] = []
-        for part in content:
-            if isinstance(part, dict) and part.get("type") == "text":
-                text = part.get("text")
-                if isinstance(text, str) and text.strip():
-                    chunks.append(text.strip())
-        return "\n".join(chunks).strip()
+        # Fast path: responses are usually a single text part.
+        if len(content) == 1 and isinstance(content[0], dict) and content[0].get("type") == "text":
+            text = content[0].get("text")
+            return text.strip() if isinstance(text, str) else ""
+        return "\n".join(
+            stripped
+            for part in content
+            if isinstance(part, dict)
+            and part.get("type") == "text"
+            and isinstance((text := part.get("text")), str)
+            and (stripped := text.strip())
+        )
     return str(content).strip()
 
 
+_JSON_DECODER = json.JSONDecoder()
+
+
 def _parse_json_object(text: str) -> dict[str, Any] | None:
     candidate = text.strip()
     if not candidate:
@@ -480,23 +774,38 @@ def _parse_json_object(text: str) -> dict[str, Any] | None:
 
     parsed: Any
     try:
-        parsed = json.loads(candidate)
+        parsed = _json_loads(candidate)
         if isinstance(parsed, dict):
             return parsed
     except Exception:
         pass
 
+    # Fallback for JSON embedded in prose: decode in place from the first
+    # "{" instead of rescanning for a closing brace and re-parsing a slice.
     start = candidate.find("{")
-    end = candidate.rfind("}")
-    if start == -1 or end == -1 or end <= start:
+    if start == -1:
         return None
     try:
-        parsed = json.loads(candidate[start : end + 1])
-        if isinstance(parsed, dict):
-            return parsed
-    except Exception:
+        parsed, _ = _JSON_DECODER.raw_decode(candidate, start)
+    except ValueError:
         return None
-    return None
+    return parsed if isinstance(parsed, dict) else None
+
+
+# Shared across every sufficiency check; only the user message varies.
+_SUFFICIENCY_SYSTEM_MSG: dict[str, Any] = {
+    "role": "system",
+    "content": (
+        "You are a strict answer sufficiency checker.\n"
+        "Decide if the draft already answers the task well enough to stop browsing.\n"
+        "Return ONLY JSON with keys: is_sufficient (bool), confidence (0..1), "
+        "final_answer (string), missing (string).\n"
+        "If sufficient, final_answer must be complete and concise.\n"
+        "If not sufficient, set missing to the key unresolved gap."
+    ),
+}
+
+_SUFFICIENCY_USER_TMPL = "TASK:\n{task}\n\nDRAFT_ANSWER:\n{draft}\n\nShould the agent stop now?"
 
 
 def maybe_finalize_early(
@@ -512,29 +821,15 @@ def maybe_finalize_early(
         return None
 
     check_messages: list[dict[str, Any]] = [
-        {
-            "role": "system",
-            "content": (
-                "You are a strict answer sufficiency checker.\n"
-                "Decide if the draft already answers the task well enough to stop browsing.\n"
-                "Return ONLY JSON with keys: is_sufficient (bool), confidence (0..1), "
-                "final_answer (string), missing (string).\n"
-                "If sufficient, final_answer must be complete and concise.\n"
-                "If not sufficient, set missing to the key unresolved gap."
-            ),
-        },
+        _SUFFICIENCY_SYSTEM_MSG,
         {
             "role": "user",
-            "content": (
-                f"TASK:\n{task}\n\n"
-                f"DRAFT_ANSWER:\n{assistant_text}\n\n"
-                "Should the agent stop now?"
-            ),
+            "content": _SUFFICIENCY_USER_TMPL.format(task=task, draft=assistant_text),
         },
     ]
 
     try:
-        resp = client.chat.completions.create(model=config.model, messages=check_messages)
+        resp = _post_chat(client, config, check_messages)
     except Exception:
         return None
 
@@ -564,6 +859,23 @@ def maybe_finalize_early(
     return final_answer
 
 
+# Content-part templates for _make_tool_msg; the dict-merge copies them
+# rather than respelling the nested literals on every step.
+_TEXT_PART: dict[str, Any] = {"type": "text"}
+_IMAGE_PART: dict[str, Any] = {"type": "image_url"}
+
+
+def _make_tool_msg(tc_id: str, url_prefix: str, b64: str, text: str) -> dict[str, Any]:
+    return {
+        "role": "tool",
+        "tool_call_id": tc_id,
+        "content": [
+            _TEXT_PART | {"text": text},
+            _IMAGE_PART | {"image_url": {"url": url_prefix + b64}},
+        ],
+    }
+
+
 def _tool_args_summary(tool_name: str, args: dict[str, Any]) -> str:
     if "coordinates" in args:
         return f"({args['coordinates'][0]}, {args['coordinates'][1]})"
@@ -582,14 +894,16 @@ def _tool_args_summary(tool_name: str, args: dict[str, Any]) -> str:
 
 def _force_finalize(
     *,
-    messages: list[dict[str, Any]],
+    messages: MessageLog,
     client: OpenAI,
     config: AgentConfig,
     task: str,
 ) -> None:
     """Called when max_steps is exhausted. Asks the model to synthesize a final answer
     from everything gathered so far, without calling any more tools."""
-    synthesis_messages = messages + [
+    # Appending in place avoids copying the whole transcript (megabytes of
+    # base64 screenshots) just to add one instruction; pop restores the log.
+    messages.append(
         {
             "role": "user",
             "content": (
@@ -600,11 +914,10 @@ def _force_finalize(
                 f"{task}"
             ),
         }
-    ]
-
+    )
     try:
         with status_spinner("Synthesizing final answer..."):
-            resp = n1_step(synthesis_messages, client=client, config=config)
+            resp = n1_step(messages, client=client, config=config)
         msg = _first_choice_message(resp, context="Force-finalize response")
         answer = _content_to_text(msg.content)
         if answer:
@@ -613,6 +926,8 @@ def _force_finalize(
             print_error("Agent exhausted all steps and could not produce a final answer.")
     except Exception as exc:
         print_error(f"Failed to synthesize final answer: {exc}")
+    finally:
+        messages.pop()
 
     print_done()
 
@@ -625,26 +940,30 @@ def run_agent(
     max_steps: int = 30,
     show_inspect_url: bool = False,
 ) -> None:
+    from playwright.sync_api import Error as PlaywrightError, sync_playwright
+
     print_banner()
     print_config_summary(task, start_url, max_steps, config.model)
 
     client = create_client(config)
 
-    with sync_playwright() as p:
+    # One worker is enough: a single sufficiency check runs concurrently
+    # with the tool I/O of its own step.
+    with sync_playwright() as p, ThreadPoolExecutor(max_workers=1) as sufficiency_executor:
         browser = p.chromium.connect_over_cdp(config.cdp_wss)
         context = browser.contexts[0] if browser.contexts else browser.new_context()
         page = context.pages[0] if context.pages else context.new_page()
 
         if show_inspect_url:
             try:
-                cdp_client = page.context.new_cdp_session(page)
-                frame_tree = cdp_client.send("Page.getFrameTree", {})
+                cdp = context.new_cdp_session(page)
+                frame_tree = cdp.send("Page.getFrameTree", {})
                 frame_id = (
                     ((frame_tree or {}).get("frameTree") or {}).get("frame") or {}
                 ).get("id")
                 if not isinstance(frame_id, str) or not frame_id:
                     raise RuntimeError("frame id not found")
-                inspect = cdp_client.send("Page.inspect", {"frameId": frame_id})
+                inspect = cdp.send("Page.inspect", {"frameId": frame_id})
                 inspect_url = (inspect or {}).get("url")
                 if not isinstance(inspect_url, str) or not inspect_url.strip():
                     raise RuntimeError("inspect url not found")
@@ -659,44 +978,37 @@ def run_agent(
 
         try:
             b64 = screenshot_b64(page, config)
-        except PlaywrightTimeoutError as exc:
-            retry_timeout = max(
-                config.screenshot_timeout_ms + 30_000,
-                int(config.screenshot_timeout_ms * 1.5),
-            )
+        except PlaywrightError as exc:
+            page.wait_for_timeout(1_000)
             try:
-                b64 = screenshot_b64(page, config, timeout_ms=retry_timeout)
+                b64 = screenshot_b64(page, config)
                 print_warning(
-                    f"Initial screenshot timed out at {config.screenshot_timeout_ms}ms; "
-                    f"captured after retry at {retry_timeout}ms."
+                    f"Initial screenshot failed ({type(exc).__name__}); "
+                    "captured after retry."
                 )
-            except PlaywrightTimeoutError as retry_exc:
-                raise RuntimeError(
-                    "Initial screenshot timed out twice "
-                    f"({config.screenshot_timeout_ms}ms, then {retry_timeout}ms). "
-                    "Try increasing --screenshot-timeout-ms or using a lighter start URL."
-                ) from retry_exc
             except Exception as retry_exc:
                 raise RuntimeError(
-                    f"Initial screenshot retry failed: {type(retry_exc).__name__}: {retry_exc}"
+                    "Initial screenshot failed twice "
+                    f"({type(retry_exc).__name__}: {retry_exc}). "
+                    "Try a lighter start URL."
                 ) from retry_exc
         last_good_screenshot_b64 = b64
-        messages: list[dict[str, Any]] = [
-            {
-                "role": "system",
-                "content": BROWSER_AGENT_SYSTEM_PROMPT,
-            },
-            {
-                "role": "user",
-                "content": [
-                    {"type": "text", "text": f"[Steps remaining: {max_steps}]\n{task}"},
-                    {
-                        "type": "image_url",
-                        "image_url": {"url": f"data:{config.image_mime};base64,{b64}"},
-                    },
-                ],
-            }
-        ]
+        url_prefix = f"data:{config.image_mime};base64,"
+        messages = MessageLog(
+            [
+                _SYSTEM_MESSAGE,
+                {
+                    "role": "user",
+                    "content": [
+                        {"type": "text", "text": f"[Steps remaining: {max_steps}]\n{task}"},
+                        {
+                            "type": "image_url",
+                            "image_url": {"url": url_prefix + b64},
+                        },
+                    ],
+                },
+            ]
+        )
 
         completed = False
         for step in range(1, max_steps + 1):
@@ -716,30 +1028,33 @@ def run_agent(
                 completed = True
                 break
 
-            final_answer = maybe_finalize_early(
-                client=client,
-                config=config,
-                task=task,
-                assistant_text=assistant_text,
-            )
-            if final_answer:
-                print_early_stop()
-                print_final_answer(final_answer)
-                print_done()
-                completed = True
-                break
+            # Run the sufficiency check concurrently with the first tool
+            # action so its round-trip hides behind the tool I/O instead of
+            # serializing ahead of it.
+            sufficiency_future = None
+            if config.enable_sufficiency_check and assistant_text.strip():
+                sufficiency_future = sufficiency_executor.submit(
+                    maybe_finalize_early,
+                    client=client,
+                    config=config,
+                    task=task,
+                    assistant_text=assistant_text,
+                )
 
+            # tool_calls are the plain dicts parsed off the wire, ready to
+            # append to the history with no further serialization.
             messages.append(
                 {
                     "role": "assistant",
                     "content": assistant_text,
-                    "tool_calls": [tc.model_dump() for tc in tool_calls],
+                    "tool_calls": tool_calls,
                 }
             )
 
-            for tc in tool_calls:
-                tool_name = tc.function.name
-                args = json.loads(tc.function.arguments)
+            for tool_index, tc in enumerate(tool_calls):
+                function = tc["function"]
+                tool_name = function["name"]
+                args = _json_loads(function["arguments"])
                 print_tool_action(tool_name, _tool_args_summary(tool_name, args))
                 tool_error = ""
                 try:
@@ -755,28 +1070,24 @@ def run_agent(
                 try:
                     b64_new = screenshot_b64(page, config)
                     last_good_screenshot_b64 = b64_new
-                except PlaywrightTimeoutError:
-                    retry_timeout = max(
-                        5_000,
-                        min(20_000, max(1, config.screenshot_timeout_ms // 3)),
-                    )
+                except PlaywrightError as exc:
                     try:
-                        b64_new = screenshot_b64(page, config, timeout_ms=retry_timeout)
+                        b64_new = screenshot_b64(page, config)
                         last_good_screenshot_b64 = b64_new
                         screenshot_note = (
-                            "\nScreenshot capture recovered after a timeout retry."
+                            "\nScreenshot capture recovered after a retry."
                         )
                         print_warning(
-                            f"Screenshot timed out at {config.screenshot_timeout_ms}ms; "
-                            f"recovered with retry at {retry_timeout}ms."
+                            f"Screenshot failed ({type(exc).__name__}); "
+                            "recovered with retry."
                         )
                     except Exception:
                         b64_new = last_good_screenshot_b64
                         screenshot_note = (
-                            "\nScreenshot capture timed out; previous screenshot reused."
+                            "\nScreenshot capture failed; previous screenshot reused."
                         )
                         print_warning(
-                            f"Screenshot timed out at {config.screenshot_timeout_ms}ms; "
+                            f"Screenshot failed ({type(exc).__name__}); "
                             "reusing previous screenshot."
                         )
                 except Exception as exc:
@@ -791,28 +1102,31 @@ def run_agent(
                     )
                 tool_error_note = f"\nTool error: {tool_error}" if tool_error else ""
                 messages.append(
-                    {
-                        "role": "tool",
-                        "tool_call_id": tc.id,
-                        "content": [
-                            {
-                                "type": "text",
-                                "text": (
-                                    f"[Steps remaining: {remaining}]\nCurrent URL: {page.url}"
-                                    f"{tool_error_note}"
-                                    f"{screenshot_note}"
-                                ),
-                            },
-                            {
-                                "type": "image_url",
-                                "image_url": {
-                                    "url": f"data:{config.image_mime};base64,{b64_new}"
-                                },
-                            },
-                        ],
-                    }
+                    _make_tool_msg(
+                        tc["id"],
+                        url_prefix,
+                        b64_new,
+                        (
+                            f"[Steps remaining: {remaining}]\nCurrent URL: {page.url}"
+                            f"{tool_error_note}"
+                            f"{screenshot_note}"
+                        ),
+                    )
                 )
 
+                if sufficiency_future is not None and tool_index == 0:
+                    final_answer = sufficiency_future.result()
+                    sufficiency_future = None
+                    if final_answer:
+                        print_early_stop()
+                        print_final_answer(final_answer)
+                        print_done()
+                        completed = True
+                        break
+
+            if completed:
+                break
+
         if not completed:
             _force_finalize(messages=messages, client=client, config=config, task=task)
 
@@ -2,100 +2,192 @@
 
 from __future__ import annotations
 
-from rich.console import Console
-from rich.markup import escape
-from rich.panel import Panel
-from rich.table import Table
-from rich.text import Text
-from rich.theme import Theme
-
-THEME = Theme(
-    {
-        "brand": "bold bright_cyan",
-        "step": "bold yellow",
-        "success": "bold green",
-        "error": "bold red",
-        "info": "dim cyan",
-        "url": "underline blue",
-        "warning": "bold yellow",
-        "muted": "dim white",
-    }
-)
-
-console = Console(theme=THEME)
+import copy
+import re
+import sys
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from rich.console import Console
+
+_THEME_STYLES = {
+    "brand": "bold bright_cyan",
+    "step": "bold yellow",
+    "success": "bold green",
+    "error": "bold red",
+    "info": "dim cyan",
+    "url": "underline blue",
+    "warning": "bold yellow",
+    "muted": "dim white",
+}
+
+
+# Only text containing square brackets can be misread as markup; anything
+# else can skip rich.markup.escape entirely.
+_MARKUP_RE = re.compile(r"[\[\]]")
+
+
+def _escape_markup(text: str) -> str:
+    if _MARKUP_RE.search(text) is None:
+        return text
+    from rich.markup import escape
+
+    return escape(text)
+
+
+@lru_cache(maxsize=1)
+def _get_theme():
+    # Styles are parsed into Style objects exactly once and shared by the
+    # console and the THEME export; Theme would otherwise re-parse the
+    # strings per construction.
+    from rich.style import Style
+    from rich.theme import Theme
+
+    return Theme({name: Style.parse(value) for name, value in _THEME_STYLES.items()})
+
+
+@lru_cache(maxsize=1)
+def _get_console() -> Console:
+    # Built on first print rather than at import, so CLI paths that never
+    # render (e.g. --help, config errors caught early) skip Rich entirely.
+    from rich.console import Console
+
+    return Console(theme=_get_theme())
+
+
+def __getattr__(name: str) -> Any:
+    # Keep `from .console import console` (and THEME) working lazily.
+    if name == "console":
+        return _get_console()
+    if name == "THEME":
+        return _get_theme()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def print_banner() -> None:
+    # Piped output gets the plain text without box drawing or styling
+    # (and without the panel layout pass).
+    if not _get_console().is_terminal:
+        print("n1-brightdata  Browser Agent")
+        return
+    from rich.panel import Panel
+    from rich.text import Text
+
     banner = Text()
     banner.append("n1-brightdata", style="bold bright_cyan")
     banner.append("  Browser Agent", style="dim white")
-    console.print(
+    _get_console().print(
         Panel(banner, border_style="bright_cyan", padding=(0, 2)),
     )
 
 
-def print_config_summary(
-    task: str, url: str, max_steps: int, model: str,
-) -> None:
+@lru_cache(maxsize=1)
+def _config_table_template():
+    from rich.table import Table
+
     table = Table(show_header=False, border_style="dim", padding=(0, 1))
     table.add_column("Key", style="info")
     table.add_column("Value", style="white")
+    return table
+
+
+def _clone_table(template):
+    # Shallow-copy the table but give it fresh row state: copied columns
+    # would otherwise share their _cells lists with the template.
+    table = copy.copy(template)
+    table.columns = [copy.copy(column) for column in template.columns]
+    for column in table.columns:
+        column._cells = []
+    table.rows = []
+    return table
+
+
+@lru_cache(maxsize=1)
+def _final_answer_panel_template():
+    from rich.panel import Panel
+
+    return Panel(
+        "",
+        title="[success]Final Answer[/success]",
+        border_style="green",
+        padding=(1, 2),
+    )
+
+
+def print_config_summary(
+    task: str, url: str, max_steps: int, model: str,
+) -> None:
+    table = _clone_table(_config_table_template())
     table.add_row("Task", task)
     table.add_row("Start URL", url)
     table.add_row("Max steps", str(max_steps))
     table.add_row("Model", model)
+    console = _get_console()
     console.print(table)
     console.print()
 
 
 def print_step(step_num: int, max_steps: int, assistant_text: str) -> None:
-    header = Text()
-    header.append(f"Step {step_num}/{max_steps}", style="step")
-    header.append("  ", style="")
-    display = assistant_text or "[no text]"
-    if len(display) > 300:
+    from rich.markup import escape
+
+    # Slice before testing length so long assistant texts are copied at
+    # most 301 characters, never in full.
+    display = (assistant_text or "[no text]")[:301]
+    if len(display) == 301:
         display = display[:300] + "..."
-    header.append(display, style="white")
-    console.print(header)
+    _get_console().print(
+        f"[step]Step {step_num}/{max_steps}[/step]  {escape(display)}",
+        highlight=False,
+    )
 
 
 def print_tool_action(tool_name: str, args_summary: str) -> None:
-    console.print(f"  [info]> {tool_name}[/info] {escape(args_summary)}", highlight=False)
+    _get_console().print(
+        f"  [info]> {tool_name}[/info] {_escape_markup(args_summary)}", highlight=False
+    )
 
 
 def print_trim_notice(removed: int, size_mb: float, *, retry: bool = False) -> None:
     prefix = "Retrying after extra trim" if retry else "Trimmed"
-    console.print(
+    _get_console().print(
         f"  [warning]{prefix} {removed} old screenshot(s); "
         f"payload ~{size_mb:.2f} MB[/warning]"
     )
 
 
 def print_early_stop() -> None:
-    console.print("\n[success]Early stop:[/success] sufficient information collected.\n")
+    if not _get_console().is_terminal:
+        print("\nEarly stop: sufficient information collected.\n")
+        return
+    _get_console().print("\n[success]Early stop:[/success] sufficient information collected.\n")
 
 
 def print_done() -> None:
-    console.print("[success]Done.[/success]\n")
+    if not _get_console().is_terminal:
+        print("Done.\n")
+        return
+    _get_console().print("[success]Done.[/success]\n")
 
 
 def print_final_answer(answer: str) -> None:
+    panel = copy.copy(_final_answer_panel_template())
+    panel.renderable = answer
+    console = _get_console()
     console.print()
-    console.print(
-        Panel(
-            answer,
-            title="[success]Final Answer[/success]",
-            border_style="green",
-            padding=(1, 2),
-        )
-    )
+    console.print(panel)
     console.print()
 
 
 def print_error(message: str) -> None:
-    console.print(
+    if not _get_console().is_terminal:
+        print(message, file=sys.stderr)
+        return
+    from rich.panel import Panel
+
+    _get_console().print(
         Panel(
-            f"[error]{escape(message)}[/error]",
+            f"[error]{_escape_markup(message)}[/error]",
             title="Error",
             border_style="red",
         )
@@ -103,15 +195,17 @@ def print_error(message: str) -> None:
 
 
 def print_warning(message: str) -> None:
-    console.print(f"[warning]{escape(message)}[/warning]")
+    _get_console().print(f"[warning]{_escape_markup(message)}[/warning]")
 
 
 def print_inspect_url(url: str) -> None:
-    console.print(
+    from rich.markup import escape
+
+    _get_console().print(
         f"[info]Inspect session:[/info] [url]{escape(url)}[/url]",
         highlight=False,
     )
 
 
 def status_spinner(message: str) -> "Console.status":
-    return console.status(message, spinner="dots")
+    return _get_console().status(message, spinner="dots")